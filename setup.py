@@ -6,20 +6,24 @@ Helps install dependencies and download required models
 import subprocess
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 def run_command(command, description):
-    """Run a shell command and handle errors."""
+    """Run a command (list of arguments, no shell) streaming its output, and handle errors."""
     print(f"\n{'='*60}")
     print(f"📦 {description}")
-    print(f"{'='*60}")
+    print(f"{'='*60}", flush=True)
     try:
-        result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
-        print(result.stdout)
+        subprocess.run(command, check=True)
         return True
     except subprocess.CalledProcessError as e:
-        print(f" Error: {e.stderr}")
+        print(f" Error: command exited with status {e.returncode}")
         return False
 
+def run_commands(tasks):
+    """Run (command, description) pairs one after another."""
+    return all([run_command(command, description) for command, description in tasks])
+
 def main():
     """Main setup function."""
     print("🏥 Swasthya - Setup Script")
@@ -27,17 +31,15 @@ def main():
     
     # Step 1: Install Python packages
     print("\nStep 1: Installing Python packages...")
-    if not run_command(f"{sys.executable} -m pip install -r requirements.txt", 
+    if not run_command([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"],
                       "Installing requirements"):
         print("⚠️  Some packages may have failed to install. Please check manually.")
     
     # Step 2: Download spaCy model
-    print("\nStep 2: Downloading spaCy model...")
-    run_command(f"{sys.executable} -m spacy download en_core_web_sm", 
-               "Downloading en_core_web_sm model")
+    spacy_task = ([sys.executable, "-m", "spacy", "download", "en_core_web_sm"],
+                  "Downloading en_core_web_sm model")
     
     # Step 3: Download NLTK data
-    print("\nStep 3: Downloading NLTK data...")
     nltk_script = """
 import nltk
 try:
@@ -47,21 +49,34 @@ try:
 except Exception as e:
     print(f"⚠️  NLTK download error: {e}")
 """
-    run_command(f"{sys.executable} -c \"{nltk_script}\"", 
-               "Downloading NLTK data")
+    nltk_task = ([sys.executable, "-c", nltk_script], "Downloading NLTK data")
     
-    # Step 4: Optional scispaCy model
-    print("\nStep 4: Optional - Installing scispaCy medical model...")
+    # Step 4: Optional scispaCy model (asked up front so downloads can run unattended)
+    print("\nStep 4 (optional): scispaCy medical model")
     print("(This is optional but recommended for better medical NER)")
     response = input("Install scispaCy model? (y/n): ").strip().lower()
+    pip_tasks = [spacy_task]
     if response == 'y':
-        run_command(
-            f"{sys.executable} -m pip install https://s3-us-west-2.amazonaws.com/ai2-s2-scispacy/releases/v0.5.4/en_ner_bc5cdr_md-0.5.4.tar.gz",
+        pip_tasks.append((
+            [sys.executable, "-m", "pip", "install",
+             "https://s3-us-west-2.amazonaws.com/ai2-s2-scispacy/releases/v0.5.4/en_ner_bc5cdr_md-0.5.4.tar.gz"],
             "Installing scispaCy medical model"
-        )
+        ))
     else:
         print(" Skipping scispaCy model installation")
     
+    # Steps 2-4 only depend on step 1, so run them concurrently. The spaCy
+    # and scispaCy installs both go through pip and share one worker so two
+    # pip processes never write to site-packages at the same time.
+    print("\nSteps 2-4: Downloading models and data...")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(run_commands, pip_tasks),
+            executor.submit(run_command, *nltk_task),
+        ]
+        for future in as_completed(futures):
+            future.result()
+    
     # Create necessary directories
     print("\nStep 5: Creating directories...")
     directories = [
@@ -73,9 +88,21 @@ except Exception as e:
         "models/summarization"
     ]
     
+    # List each parent directory once and only call makedirs for missing entries
+    existing = {}
     for directory in directories:
-        os.makedirs(directory, exist_ok=True)
-        print(f" Created: {directory}")
+        parent, name = os.path.split(directory)
+        if parent not in existing:
+            try:
+                with os.scandir(parent or ".") as entries:
+                    existing[parent] = {entry.name for entry in entries if entry.is_dir()}
+            except FileNotFoundError:
+                existing[parent] = set()
+        if name in existing[parent]:
+            print(f" Exists: {directory}")
+        else:
+            os.makedirs(directory, exist_ok=True)
+            print(f" Created: {directory}")
     
     print("\n" + "="*60)
     print(" Setup completed!")
@@ -5,8 +5,9 @@ Extracts important keywords using KeyBERT, TF-IDF, and noun chunking
 
 import json
 import re
-from typing import List, Dict
+from typing import List, Dict, Optional, Sequence, Tuple
 from collections import Counter
+from functools import lru_cache
 
 try:
     from keybert import KeyBERT
@@ -16,18 +17,28 @@ except ImportError:
     print("Warning: KeyBERT not available. Using fallback methods.")
 
 try:
+    import numpy as np
     from sklearn.feature_extraction.text import TfidfVectorizer
     SKLEARN_AVAILABLE = True
 except ImportError:
     SKLEARN_AVAILABLE = False
 
-try:
-    import spacy
-    nlp = spacy.load("en_core_web_sm")
-    SPACY_AVAILABLE = True
-except:
-    SPACY_AVAILABLE = False
-    nlp = None
+from .spacy_models import NOUN_CHUNK_DISABLE, PIPE_BATCH_SIZE, load_model, parse, pipe_n_process
+
+nlp = load_model("en_core_web_sm")
+SPACY_AVAILABLE = nlp is not None
+
+# Very common words dropped from the combined keyword ranking
+STOP_WORDS = frozenset({'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by'})
+
+# Keyword extractors, in the order extract_keywords tries them
+KEYWORD_METHODS = ("keybert", "tfidf", "noun")
+
+
+@lru_cache(maxsize=None)
+def _get_keybert() -> "KeyBERT":
+    """Load the KeyBERT model (and its sentence-transformer) once per process."""
+    return KeyBERT()
 
 
 def extract_keywords_keybert(text: str, top_n: int = 10) -> List[str]:
@@ -36,14 +47,60 @@ def extract_keywords_keybert(text: str, top_n: int = 10) -> List[str]:
         return []
     
     try:
-        kw_model = KeyBERT()
-        keywords = kw_model.extract_keywords(text, keyphrase_ngram_range=(1, 2), top_n=top_n)
-        return [kw[0] for kw in keywords]
+        return list(_keybert_keywords(text, top_n))
     except Exception as e:
         print(f"KeyBERT extraction failed: {e}")
         return []
 
 
+@lru_cache(maxsize=1024)
+def _keybert_keywords(text: str, top_n: int) -> Tuple[str, ...]:
+    """Run KeyBERT on text, memoized so re-processed transcripts skip it (failures are not cached)."""
+    kw_model = _get_keybert()
+    keywords = kw_model.extract_keywords(text, keyphrase_ngram_range=(1, 2), top_n=top_n)
+    return tuple(kw[0] for kw in keywords)
+
+
+def extract_keywords_keybert_batch(texts: List[str], top_n: int = 10) -> List[List[str]]:
+    """Extract keywords for several texts with one KeyBERT call (batched embedding)."""
+    if not KEYBERT_AVAILABLE or not texts:
+        return [[] for _ in texts]
+    
+    try:
+        kw_model = _get_keybert()
+        keywords = kw_model.extract_keywords(texts, keyphrase_ngram_range=(1, 2), top_n=top_n)
+        if len(texts) == 1:
+            # KeyBERT returns a flat list for a single document
+            keywords = [keywords]
+        return [[kw[0] for kw in doc_keywords] for doc_keywords in keywords]
+    except Exception as e:
+        print(f"KeyBERT extraction failed: {e}")
+        return [[] for _ in texts]
+
+
+def top_n_indices(scores: "np.ndarray", top_n: int) -> "np.ndarray":
+    """
+    Return the indices of the top_n highest scores, highest first.
+    
+    np.argpartition selects the top entries in linear time, so only those
+    top_n entries are sorted.
+    
+    Args:
+        scores: 1-D array of scores
+        top_n: Number of indices to return
+        
+    Returns:
+        Array of indices into scores
+    """
+    if top_n <= 0:
+        return np.array([], dtype=np.intp)
+    if top_n < scores.size:
+        candidates = np.argpartition(-scores, top_n - 1)[:top_n]
+    else:
+        candidates = np.arange(scores.size)
+    return candidates[np.argsort(-scores[candidates], kind='stable')]
+
+
 def extract_keywords_tfidf(text: str, top_n: int = 10) -> List[str]:
     """Extract keywords using TF-IDF."""
     if not SKLEARN_AVAILABLE:
@@ -65,7 +122,7 @@ def extract_keywords_tfidf(text: str, top_n: int = 10) -> List[str]:
         
         # Get top keywords
         scores = tfidf_matrix.sum(axis=0).A1
-        top_indices = scores.argsort()[-top_n:][::-1]
+        top_indices = top_n_indices(scores, top_n)
         
         keywords = [feature_names[i] for i in top_indices]
         return keywords
@@ -80,70 +137,105 @@ def extract_noun_phrases(text: str, top_n: int = 10) -> List[str]:
         return []
     
     try:
-        doc = nlp(text)
-        noun_phrases = []
-        
-        # Extract noun chunks
-        for chunk in doc.noun_chunks:
-            if len(chunk.text.split()) <= 3:  # Limit to 3-word phrases
-                noun_phrases.append(chunk.text.lower())
-        
-        # Count and get most frequent
-        phrase_counts = Counter(noun_phrases)
-        top_phrases = [phrase for phrase, count in phrase_counts.most_common(top_n)]
-        
-        return top_phrases
+        doc = parse(nlp, text, NOUN_CHUNK_DISABLE)
+        return top_noun_phrases(doc, top_n=top_n)
     except Exception as e:
         print(f"Noun phrase extraction failed: {e}")
         return []
 
 
-def extract_keywords(text: str, top_n: int = 15) -> List[str]:
+def extract_noun_phrases_batch(texts: List[str], top_n: int = 10) -> List[List[str]]:
+    """Extract noun phrases from several texts, batching them through nlp.pipe."""
+    if not SPACY_AVAILABLE or nlp is None:
+        return [[] for _ in texts]
+    
+    try:
+        n_process = pipe_n_process(len(texts))
+        docs = nlp.pipe(texts, disable=NOUN_CHUNK_DISABLE, batch_size=PIPE_BATCH_SIZE, n_process=n_process)
+        return [top_noun_phrases(doc, top_n=top_n) for doc in docs]
+    except Exception as e:
+        print(f"Noun phrase extraction failed: {e}")
+        return [[] for _ in texts]
+
+
+def top_noun_phrases(doc, top_n: int = 10) -> List[str]:
+    """Return the most frequent short noun chunks of a processed spaCy doc."""
+    noun_phrases = []
+    
+    # Extract noun chunks
+    for chunk in doc.noun_chunks:
+        if len(chunk.text.split()) <= 3:  # Limit to 3-word phrases
+            noun_phrases.append(chunk.text.lower())
+    
+    # Count and get most frequent
+    phrase_counts = Counter(noun_phrases)
+    top_phrases = [phrase for phrase, count in phrase_counts.most_common(top_n)]
+    
+    return top_phrases
+
+
+def extract_keywords(
+    text: str,
+    top_n: int = 15,
+    keybert_keywords: Optional[List[str]] = None,
+    tfidf_keywords: Optional[List[str]] = None,
+    noun_phrases: Optional[List[str]] = None,
+    methods: Sequence[str] = KEYWORD_METHODS
+) -> List[str]:
     """
     Extract keywords using multiple methods and combine results.
     
+    Methods run in order and stop as soon as top_n keywords have been found,
+    so later (expensive) extractors are skipped when earlier ones suffice.
+    
     Args:
         text: Input text
         top_n: Number of keywords to extract
+        keybert_keywords: KeyBERT results computed in advance (e.g. by a
+            batched call); KeyBERT is run on the text when omitted
+        tfidf_keywords: TF-IDF results computed in advance; TF-IDF is run
+            on the text when omitted
+        noun_phrases: Noun phrases computed in advance; spaCy is run on
+            the text when omitted
+        methods: Extractors to use, in order: "keybert", "tfidf", "noun"
         
     Returns:
         List of extracted keywords
     """
-    all_keywords = []
-    
-    # Try KeyBERT first
-    keybert_kw = extract_keywords_keybert(text, top_n=top_n)
-    all_keywords.extend(keybert_kw)
-    
-    # Try TF-IDF
-    tfidf_kw = extract_keywords_tfidf(text, top_n=top_n)
-    all_keywords.extend(tfidf_kw)
-    
-    # Try noun phrases
-    noun_kw = extract_noun_phrases(text, top_n=top_n)
-    all_keywords.extend(noun_kw)
+    keyword_counts = Counter()
+    filtered_keywords = []
     
-    # Deduplicate and rank
-    keyword_counts = Counter([kw.lower() for kw in all_keywords])
-    
-    # Filter out very common words
-    stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by'}
-    filtered_keywords = [
-        kw for kw, count in keyword_counts.most_common(top_n * 2)
-        if kw not in stop_words and len(kw) > 2
-    ]
+    for method in methods:
+        if method == "keybert":
+            if keybert_keywords is None:
+                keybert_keywords = extract_keywords_keybert(text, top_n=top_n)
+            method_keywords = keybert_keywords
+        elif method == "tfidf":
+            if tfidf_keywords is None:
+                tfidf_keywords = extract_keywords_tfidf(text, top_n=top_n)
+            method_keywords = tfidf_keywords
+        elif method == "noun":
+            if noun_phrases is None:
+                noun_phrases = extract_noun_phrases(text, top_n=top_n)
+            method_keywords = noun_phrases
+        else:
+            raise ValueError(f"Unknown keyword extraction method: {method}")
+        
+        # Deduplicate and rank (most_common takes the top entries with a heap)
+        keyword_counts.update(kw.lower() for kw in method_keywords)
+        
+        # Filter out very common words; Counter keys are already unique
+        filtered_keywords = [
+            kw for kw, count in keyword_counts.most_common(top_n * 2)
+            if kw not in STOP_WORDS and len(kw) > 2
+        ]
+        
+        # Enough keywords already; skip the remaining extractors
+        if len(filtered_keywords) >= top_n:
+            break
     
     # Return top N unique keywords
-    seen = set()
-    result = []
-    for kw in filtered_keywords:
-        if kw not in seen:
-            seen.add(kw)
-            result.append(kw)
-            if len(result) >= top_n:
-                break
-    
-    return result
+    return filtered_keywords[:top_n]
 
 
 def extract_keywords_from_conversation(processed_data: Dict[str, str]) -> Dict[str, List[str]]:
@@ -165,6 +257,45 @@ def extract_keywords_from_conversation(processed_data: Dict[str, str]) -> Dict[s
     }
 
 
+def extract_keywords_from_conversation_batch(processed_batch: List[Dict[str, str]]) -> List[Dict[str, List[str]]]:
+    """
+    Extract keywords from several processed conversations.
+    
+    KeyBERT runs once over all conversations so the sentence-transformer
+    embeds them in batches. Only the conversations that KeyBERT and TF-IDF
+    leave short of keywords are parsed for noun phrases, through nlp.pipe.
+    
+    Args:
+        processed_batch: List of dictionaries with processed text
+        
+    Returns:
+        List of dictionaries with extracted keywords, in input order
+    """
+    full_texts = [processed_data.get("full_text", "") for processed_data in processed_batch]
+    keybert_batch = extract_keywords_keybert_batch(full_texts, top_n=15)
+    
+    keywords_batch = []
+    tfidf_batch = []
+    for full_text, keybert_keywords in zip(full_texts, keybert_batch):
+        keywords = extract_keywords(full_text, top_n=15, keybert_keywords=keybert_keywords, methods=("keybert",))
+        tfidf_keywords = None
+        if len(keywords) < 15:
+            tfidf_keywords = extract_keywords_tfidf(full_text, top_n=15)
+            keywords = extract_keywords(full_text, top_n=15, keybert_keywords=keybert_keywords,
+                                        tfidf_keywords=tfidf_keywords, methods=("keybert", "tfidf"))
+        keywords_batch.append(keywords)
+        tfidf_batch.append(tfidf_keywords)
+    
+    # Noun phrases only for the conversations still short of keywords
+    short = [i for i, keywords in enumerate(keywords_batch) if len(keywords) < 15]
+    noun_phrase_batch = extract_noun_phrases_batch([full_texts[i] for i in short], top_n=15)
+    for i, noun_phrases in zip(short, noun_phrase_batch):
+        keywords_batch[i] = extract_keywords(full_texts[i], top_n=15, keybert_keywords=keybert_batch[i],
+                                             tfidf_keywords=tfidf_batch[i], noun_phrases=noun_phrases)
+    
+    return [{"Keywords": keywords} for keywords in keywords_batch]
+
+
 if __name__ == "__main__":
     # Test keyword extraction
     test_text = "Patient experienced whiplash injury after car accident. Treatment includes physiotherapy sessions and painkillers. Full recovery expected within six months."
@@ -0,0 +1,91 @@
+"""
+Keyword Matching Module
+Finds which of a fixed set of keywords occur in a text in a single scan
+"""
+
+import re
+from typing import Dict, Iterable, Pattern, Set, Tuple
+
+KeywordMatcher = Tuple[Pattern, Dict[str, Tuple[str, ...]]]
+
+
+def compile_keywords(keywords: Iterable[str]) -> KeywordMatcher:
+    """
+    Compile keywords into a matcher for find_keywords.
+
+    The keywords are compiled into one lookahead pattern shaped like a trie
+    (see trie_pattern), so every position of the text is tried once against
+    all keywords and the regex engine branches on each character instead of
+    retrying every keyword. Keywords that are a prefix of a longer keyword
+    are shadowed by it at the same position, so each keyword also maps to
+    its prefixes.
+
+    Args:
+        keywords: Lowercase keywords to look for
+
+    Returns:
+        Compiled pattern and keyword -> (keyword, *prefixes) mapping
+    """
+    unique = sorted(set(keywords), key=len, reverse=True)
+    pattern = re.compile("(?=(" + trie_pattern(unique) + "))")
+    prefixes = {
+        keyword: tuple(other for other in unique if keyword.startswith(other))
+        for keyword in unique
+    }
+    return pattern, prefixes
+
+
+def trie_pattern(keywords: Iterable[str]) -> str:
+    """
+    Build a regex matching the longest of the keywords at a position.
+
+    Keywords sharing a prefix share a branch, e.g. ['ex', 'exam', 'exercise']
+    becomes 'ex(?:am|ercise)?'. Sibling branches start with different
+    characters, and optional endings are tried before stopping, so the match
+    is the longest keyword starting at that position.
+
+    Args:
+        keywords: Non-empty keywords
+
+    Returns:
+        Regex source (no capturing groups)
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}  # End of a keyword
+    return _trie_node_pattern(trie)
+
+
+def _trie_node_pattern(node: Dict[str, Dict]) -> str:
+    """Regex for the keyword suffixes below a trie node."""
+    terminal = "" in node
+    branches = [re.escape(char) + _trie_node_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ""
+    if len(branches) == 1 and not terminal:
+        return branches[0]
+    alternation = "(?:" + "|".join(branches) + ")"
+    return alternation + "?" if terminal else alternation
+
+
+def find_keywords(matcher: KeywordMatcher, text_lower: str) -> Set[str]:
+    """
+    Find the keywords that occur anywhere in a lowercased text.
+
+    Equivalent to {keyword for keyword in keywords if keyword in text_lower}.
+
+    Args:
+        matcher: Matcher built by compile_keywords
+        text_lower: Lowercased text to scan
+
+    Returns:
+        Set of keywords found in the text
+    """
+    pattern, prefixes = matcher
+    found = set()
+    for keyword in set(pattern.findall(text_lower)):
+        found.update(prefixes[keyword])
+    return found
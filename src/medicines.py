@@ -0,0 +1,128 @@
+"""
+Medicines Module
+Symptom keywords and medicine tables used by the Streamlit Home tab
+"""
+
+import re
+from types import MappingProxyType
+from typing import Dict, List
+
+# Canonical medicine table; both symptom maps below refer to entries by id
+MEDICINES = MappingProxyType({
+    'paracetamol_500': {'medicine': 'Paracetamol 500mg', 'dosage': '1 tablet every 4-6 hours'},
+    'ibuprofen_400': {'medicine': 'Ibuprofen 400mg', 'dosage': '1 tablet every 6-8 hours'},
+    'cough_syrup': {'medicine': 'Cough syrup', 'dosage': '10ml every 4-6 hours'},
+    'dextromethorphan': {'medicine': 'Dextromethorphan', 'dosage': '10-20mg every 4 hours'},
+    'vitamin_c': {'medicine': 'Vitamin C tablets', 'dosage': '1 tablet daily'},
+    'throat_lozenges': {'medicine': 'Throat lozenges', 'dosage': '1 lozenge every 2-3 hours'},
+    'ondansetron_4': {'medicine': 'Ondansetron 4mg', 'dosage': '1 tablet every 8 hours'},
+    'dimenhydrinate_50': {'medicine': 'Dimenhydrinate 50mg', 'dosage': '1 tablet every 4-6 hours'},
+    'domperidone_10': {'medicine': 'Domperidone 10mg', 'dosage': '1 tablet every 8 hours'},
+    'oral_rehydration_salts': {'medicine': 'Oral rehydration salts', 'dosage': '1 packet in water every hour'},
+    'loperamide_2': {'medicine': 'Loperamide 2mg', 'dosage': '1 tablet after each loose stool'},
+    'lactulose_syrup': {'medicine': 'Lactulose syrup', 'dosage': '15-30ml daily'},
+    'bisacodyl_5': {'medicine': 'Bisacodyl 5mg', 'dosage': '1 tablet daily'},
+    'multivitamin': {'medicine': 'Multivitamin', 'dosage': '1 tablet daily'},
+    'iron_supplement': {'medicine': 'Iron supplement', 'dosage': 'As prescribed'},
+    'melatonin_3': {'medicine': 'Melatonin 3mg', 'dosage': '1 tablet 30 minutes before sleep'},
+    'diphenhydramine_25': {'medicine': 'Diphenhydramine 25mg', 'dosage': '1 tablet before sleep'},
+    'alprazolam_0_25': {'medicine': 'Alprazolam 0.25mg', 'dosage': 'As prescribed by doctor'},
+    'sertraline_25': {'medicine': 'Sertraline 25mg', 'dosage': 'As prescribed by doctor'},
+    'escitalopram_5': {'medicine': 'Escitalopram 5mg', 'dosage': 'As prescribed by doctor'},
+    'cetirizine_10': {'medicine': 'Cetirizine 10mg', 'dosage': '1 tablet daily'},
+    'loratadine_10': {'medicine': 'Loratadine 10mg', 'dosage': '1 tablet daily'},
+    'hydrocortisone_cream': {'medicine': 'Hydrocortisone cream', 'dosage': 'Apply 2-3 times daily'},
+    'amoxicillin_500': {'medicine': 'Amoxicillin 500mg', 'dosage': '1 capsule every 8 hours'},
+    'azithromycin_500': {'medicine': 'Azithromycin 500mg', 'dosage': '1 tablet daily for 3 days'}
+})
+
+# Simple symptom to medicine mapping, by MEDICINES id
+MEDICINE_MAP = MappingProxyType({
+    'fever': ('paracetamol_500', 'ibuprofen_400'),
+    'headache': ('paracetamol_500', 'ibuprofen_400'),
+    'pain': ('ibuprofen_400', 'paracetamol_500'),
+    'cough': ('cough_syrup', 'dextromethorphan'),
+    'cold': ('paracetamol_500', 'vitamin_c'),
+    'sore throat': ('throat_lozenges', 'paracetamol_500'),
+    'nausea': ('ondansetron_4', 'dimenhydrinate_50'),
+    'vomiting': ('ondansetron_4', 'domperidone_10'),
+    'diarrhea': ('oral_rehydration_salts', 'loperamide_2'),
+    'constipation': ('lactulose_syrup', 'bisacodyl_5'),
+    'fatigue': ('multivitamin', 'iron_supplement'),
+    'insomnia': ('melatonin_3', 'diphenhydramine_25'),
+    'anxiety': ('alprazolam_0_25', 'sertraline_25'),
+    'depression': ('sertraline_25', 'escitalopram_5'),
+    'allergy': ('cetirizine_10', 'loratadine_10'),
+    'rash': ('cetirizine_10', 'hydrocortisone_cream'),
+    'infection': ('amoxicillin_500', 'azithromycin_500')
+})
+
+# Matches any MEDICINE_MAP key; compiled once so each symptom is scanned in a
+# single case-insensitive pass instead of one substring test per key
+MEDICINE_KEY_PATTERN = re.compile('|'.join(re.escape(key) for key in MEDICINE_MAP), re.IGNORECASE)
+
+# Keywords that indicate each symptom in free conversation text
+SYMPTOM_KEYWORDS = MappingProxyType({
+    'fever': ('fever', 'temperature', 'hot'),
+    'headache': ('headache', 'head ache', 'migraine'),
+    'cough': ('cough', 'coughing'),
+    'cold': ('cold', 'runny nose', 'sneezing'),
+    'pain': ('pain', 'hurts', 'ache'),
+    'nausea': ('nausea', 'sick', 'queasy'),
+    'vomiting': ('vomit', 'throw up', 'nauseous'),
+    'diarrhea': ('diarrhea', 'loose motion'),
+    'fatigue': ('tired', 'fatigue', 'weak'),
+    'rash': ('rash', 'skin irritation'),
+    'infection': ('infection', 'infected')
+})
+
+# Single case-insensitive pass over the text for every symptom keyword. The
+# lookahead reports overlapping keywords too (e.g. "ache" inside "headache");
+# match.lastgroup names the symptom a keyword belongs to.
+SYMPTOM_PATTERN = re.compile(
+    '(?=' + '|'.join(
+        f"(?P<{symptom}>{'|'.join(re.escape(keyword) for keyword in keywords)})"
+        for symptom, keywords in SYMPTOM_KEYWORDS.items()
+    ) + ')',
+    re.IGNORECASE
+)
+
+# Display names of the symptoms, in SYMPTOM_KEYWORDS order
+SYMPTOM_TITLES = MappingProxyType({symptom: symptom.title() for symptom in SYMPTOM_KEYWORDS})
+
+# Medicines shown for each detected symptom on the Home tab
+MEDICINE_DISPLAY_MAP = MappingProxyType({
+    title: tuple(
+        f"{MEDICINES[medicine_id]['medicine']} - {MEDICINES[medicine_id]['dosage']}"
+        for medicine_id in MEDICINE_MAP[symptom]
+    )
+    for symptom, title in SYMPTOM_TITLES.items()
+    if symptom in MEDICINE_MAP
+})
+
+
+
+def generate_medicine_recommendations(symptoms: List[str], diagnosis: str) -> List[Dict[str, str]]:
+    """
+    Generate simple medicine recommendations based on symptoms.
+    
+    Args:
+        symptoms: Symptom names, e.g. from NER extraction
+        diagnosis: Diagnosis text (currently unused)
+        
+    Returns:
+        Up to 4 medicine records with 'medicine' and 'dosage' keys
+    """
+    # Keyed on medicine id so duplicates collapse as they are added; dicts
+    # keep insertion order, so the first occurrence wins
+    recommendations = {}
+    
+    # Check each symptom against our medicine map
+    for symptom in symptoms:
+        match = MEDICINE_KEY_PATTERN.search(symptom)
+        if match:
+            for medicine_id in MEDICINE_MAP[match.group(0).lower()]:
+                # Copy so callers cannot modify the shared MEDICINES entries
+                recommendations.setdefault(medicine_id, dict(MEDICINES[medicine_id]))
+    
+    return list(recommendations.values())[:4]  # Limit to 4 recommendations
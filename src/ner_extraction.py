@@ -5,23 +5,23 @@ Extracts medical entities: Symptoms, Diagnosis, Treatment, Prognosis
 
 import json
 import re
-from typing import Dict, List, Set
+from typing import Dict, List, Pattern, Set
 import spacy
 from spacy import displacy
 
+from .keyword_matching import compile_keywords, find_keywords
+from .spacy_models import NER_DISABLE, PIPE_BATCH_SIZE, load_model, parse, pipe_n_process
+
 # Try to load scispaCy model, fallback to regular spaCy if not available
-try:
-    nlp = spacy.load("en_ner_bc5cdr_md")
-    SCISPACY_AVAILABLE = True
-except OSError:
-    try:
-        nlp = spacy.load("en_core_web_sm")
-        SCISPACY_AVAILABLE = False
+nlp = load_model("en_ner_bc5cdr_md")
+SCISPACY_AVAILABLE = nlp is not None
+if nlp is None:
+    nlp = load_model("en_core_web_sm")
+    if nlp is not None:
         print("Warning: scispaCy model not found. Using en_core_web_sm instead.")
         print("For better medical NER, install: pip install https://s3-us-west-2.amazonaws.com/ai2-s2-scispacy/releases/v0.5.4/en_ner_bc5cdr_md-0.5.4.tar.gz")
-    except OSError:
+    else:
         print("Error: No spaCy model found. Please install: python -m spacy download en_core_web_sm")
-        nlp = None
 
 
 # Medical keywords for entity classification
@@ -48,6 +48,36 @@ PROGNOSIS_KEYWORDS = [
 ]
 
 
+# Entity categories in classification priority order
+CATEGORY_KEYWORDS = [
+    ("Symptoms", SYMPTOM_KEYWORDS),
+    ("Diagnosis", DIAGNOSIS_KEYWORDS),
+    ("Treatment", TREATMENT_KEYWORDS),
+    ("Prognosis", PROGNOSIS_KEYWORDS)
+]
+CATEGORY_PRIORITY = {category: rank for rank, (category, _) in enumerate(CATEGORY_KEYWORDS)}
+
+# Keyword -> highest-priority category it belongs to
+KEYWORD_TO_CATEGORY = {
+    keyword: category
+    for category, keywords in reversed(CATEGORY_KEYWORDS)
+    for keyword in keywords
+}
+ENTITY_KEYWORD_MATCHER = compile_keywords(KEYWORD_TO_CATEGORY)
+
+
+def compile_phrase_pattern(keywords: List[str]) -> Pattern:
+    """Compile a pattern matching any sentence fragment containing one of the keywords."""
+    alternation = '|'.join(re.escape(keyword) for keyword in keywords)
+    return re.compile(rf'[^.]*(?:{alternation})[^.]*\.?', re.IGNORECASE)
+
+
+SYMPTOM_PATTERN = compile_phrase_pattern(SYMPTOM_KEYWORDS)
+DIAGNOSIS_PATTERN = compile_phrase_pattern(DIAGNOSIS_KEYWORDS)
+TREATMENT_PATTERN = compile_phrase_pattern(TREATMENT_KEYWORDS)
+PROGNOSIS_PATTERN = compile_phrase_pattern(PROGNOSIS_KEYWORDS)
+
+
 def extract_medical_entities(text: str) -> Dict[str, List[str]]:
     """
     Extract medical entities from text using spaCy/scispaCy and keyword matching.
@@ -59,90 +89,128 @@ def extract_medical_entities(text: str) -> Dict[str, List[str]]:
         Dictionary with extracted entities by category
     """
     if nlp is None:
-        return {
-            "Symptoms": [],
-            "Diagnosis": [],
-            "Treatment": [],
-            "Prognosis": []
-        }
+        return empty_entities()
     
-    doc = nlp(text)
+    doc = parse(nlp, text, NER_DISABLE)
+    return extract_entities_from_doc(doc, text)
+
+
+def extract_medical_entities_batch(texts: List[str]) -> List[Dict[str, List[str]]]:
+    """
+    Extract medical entities from several texts, batching them through nlp.pipe.
     
+    Args:
+        texts: Input medical texts
+        
+    Returns:
+        List of dictionaries with extracted entities by category, in input order
+    """
+    if nlp is None:
+        return [empty_entities() for _ in texts]
+    
+    n_process = pipe_n_process(len(texts))
+    docs = nlp.pipe(texts, disable=NER_DISABLE, batch_size=PIPE_BATCH_SIZE, n_process=n_process)
+    return [extract_entities_from_doc(doc, text) for doc, text in zip(docs, texts)]
+
+
+def empty_entities() -> Dict[str, List[str]]:
+    """Return the result used when no spaCy model is available."""
+    return {
+        "Symptoms": [],
+        "Diagnosis": [],
+        "Treatment": [],
+        "Prognosis": []
+    }
+
+
+def extract_entities_from_doc(doc, text: str) -> Dict[str, List[str]]:
+    """Classify the entities of a processed spaCy doc and add keyword-based phrases from text."""
+    return merge_entities(classify_doc_entities(doc), extract_keyword_entities(text))
+
+
+def classify_doc_entities(doc) -> Dict[str, List[str]]:
+    """Assign the named entities of a processed spaCy doc to medical categories."""
     # Extract entities using NER
     entities = {}
     for ent in doc.ents:
         label = ent.label_
         text_ent = ent.text.lower()
         
-        # Classify entities based on labels and keywords
-        if any(keyword in text_ent for keyword in SYMPTOM_KEYWORDS):
-            if "Symptoms" not in entities:
-                entities["Symptoms"] = []
-            if ent.text not in entities["Symptoms"]:
-                entities["Symptoms"].append(ent.text)
-        elif any(keyword in text_ent for keyword in DIAGNOSIS_KEYWORDS):
-            if "Diagnosis" not in entities:
-                entities["Diagnosis"] = []
-            if ent.text not in entities["Diagnosis"]:
-                entities["Diagnosis"].append(ent.text)
-        elif any(keyword in text_ent for keyword in TREATMENT_KEYWORDS):
-            if "Treatment" not in entities:
-                entities["Treatment"] = []
-            if ent.text not in entities["Treatment"]:
-                entities["Treatment"].append(ent.text)
-        elif any(keyword in text_ent for keyword in PROGNOSIS_KEYWORDS):
-            if "Prognosis" not in entities:
-                entities["Prognosis"] = []
-            if ent.text not in entities["Prognosis"]:
-                entities["Prognosis"].append(ent.text)
-    
-    # Additional keyword-based extraction for better coverage
-    symptoms = extract_by_keywords(text, SYMPTOM_KEYWORDS)
-    diagnosis = extract_by_keywords(text, DIAGNOSIS_KEYWORDS)
-    treatment = extract_by_keywords(text, TREATMENT_KEYWORDS)
-    prognosis = extract_by_keywords(text, PROGNOSIS_KEYWORDS)
-    
-    # Combine NER and keyword-based results
-    result = {
-        "Symptoms": list(set(entities.get("Symptoms", []) + symptoms)),
-        "Diagnosis": list(set(entities.get("Diagnosis", []) + diagnosis)),
-        "Treatment": list(set(entities.get("Treatment", []) + treatment)),
-        "Prognosis": list(set(entities.get("Prognosis", []) + prognosis))
-    }
+        # Classify entities based on keywords, in category priority order
+        found = find_keywords(ENTITY_KEYWORD_MATCHER, text_ent)
+        if found:
+            category = min((KEYWORD_TO_CATEGORY[keyword] for keyword in found), key=CATEGORY_PRIORITY.get)
+            category_entities = entities.setdefault(category, [])
+            if ent.text not in category_entities:
+                category_entities.append(ent.text)
     
-    # Clean and deduplicate
-    for key in result:
-        result[key] = [item.strip() for item in result[key] if item.strip()]
-        result[key] = list(dict.fromkeys(result[key]))  # Preserve order, remove duplicates
+    return entities
+
+
+def extract_keyword_entities(text: str) -> Dict[str, List[str]]:
+    """Extract phrases for each medical category by keyword matching only (no spaCy)."""
+    return {
+        "Symptoms": extract_by_keywords(text, SYMPTOM_PATTERN),
+        "Diagnosis": extract_by_keywords(text, DIAGNOSIS_PATTERN),
+        "Treatment": extract_by_keywords(text, TREATMENT_PATTERN),
+        "Prognosis": extract_by_keywords(text, PROGNOSIS_PATTERN)
+    }
+
+
+def merge_entities(entities: Dict[str, List[str]], extra: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """Combine two entity dictionaries into one cleaned, deduplicated result."""
+    # Combine NER and keyword-based results, cleaning and deduplicating in
+    # one ordered pass (NER entities first)
+    result = {}
+    for category in CATEGORY_PRIORITY:
+        merged = entities.get(category, []) + extra.get(category, [])
+        result[category] = list(dict.fromkeys(item.strip() for item in merged if item.strip()))
     
     return result
 
 
-def extract_by_keywords(text: str, keywords: List[str]) -> List[str]:
-    """Extract phrases containing medical keywords."""
-    found_phrases = []
-    text_lower = text.lower()
+def enrich_ner_with_spacy(entities: Dict[str, List[str]], text: str) -> Dict[str, List[str]]:
+    """
+    Add spaCy NER results to entities extracted with lazy_spacy=True.
     
-    for keyword in keywords:
-        # Find sentences or phrases containing the keyword
-        pattern = rf'[^.]*{re.escape(keyword)}[^.]*\.?'
-        matches = re.findall(pattern, text, re.IGNORECASE)
+    Args:
+        entities: Keyword-based entities from extract_ner_from_conversation
+        text: Text the entities were extracted from
         
-        for match in matches:
-            # Extract noun phrases or meaningful chunks
-            cleaned = match.strip()
-            if len(cleaned) > 10 and len(cleaned) < 200:  # Reasonable length
-                found_phrases.append(cleaned)
+    Returns:
+        Dictionary with combined entities by category
+    """
+    if nlp is None:
+        return entities
+    
+    doc = parse(nlp, text, NER_DISABLE)
+    return merge_entities(classify_doc_entities(doc), entities)
+
+
+def extract_by_keywords(text: str, pattern: Pattern) -> List[str]:
+    """Extract phrases containing medical keywords, using a pattern from compile_phrase_pattern."""
+    found_phrases = []
     
-    return found_phrases[:10]  # Limit to top 10
+    # Find sentences or phrases containing any of the keywords in one scan
+    for match in pattern.finditer(text):
+        # Extract noun phrases or meaningful chunks
+        cleaned = match.group().strip()
+        if len(cleaned) > 10 and len(cleaned) < 200:  # Reasonable length
+            found_phrases.append(cleaned)
+            if len(found_phrases) == 10:  # Limit to top 10
+                break
+    
+    return found_phrases
 
 
-def extract_ner_from_conversation(processed_data: Dict[str, str]) -> Dict[str, List[str]]:
+def extract_ner_from_conversation(processed_data: Dict[str, str], lazy_spacy: bool = False) -> Dict[str, List[str]]:
     """
     Extract NER from processed conversation data.
     
     Args:
         processed_data: Dictionary with 'doctor_text', 'patient_text', 'full_text'
+        lazy_spacy: Only run the keyword extractor and skip spaCy; results can
+            be completed later with enrich_ner_with_spacy
         
     Returns:
         Dictionary with extracted medical entities
@@ -150,12 +218,36 @@ def extract_ner_from_conversation(processed_data: Dict[str, str]) -> Dict[str, L
     # Use full text for comprehensive extraction
     full_text = processed_data.get("full_text", "")
     
+    if lazy_spacy:
+        return merge_entities({}, extract_keyword_entities(full_text))
+    
     # Extract entities
     entities = extract_medical_entities(full_text)
     
     return entities
 
 
+def extract_ner_from_conversation_batch(
+    processed_batch: List[Dict[str, str]],
+    lazy_spacy: bool = False
+) -> List[Dict[str, List[str]]]:
+    """
+    Extract NER from several processed conversations.
+    
+    Args:
+        processed_batch: List of dictionaries with 'doctor_text', 'patient_text', 'full_text'
+        lazy_spacy: Only run the keyword extractor and skip spaCy
+        
+    Returns:
+        List of dictionaries with extracted medical entities, in input order
+    """
+    if lazy_spacy:
+        return [extract_ner_from_conversation(processed_data, lazy_spacy=True) for processed_data in processed_batch]
+    
+    full_texts = [processed_data.get("full_text", "") for processed_data in processed_batch]
+    return extract_medical_entities_batch(full_texts)
+
+
 if __name__ == "__main__":
     # Test NER extraction
     test_text = "Patient experienced neck pain and back pain after a car accident. Diagnosed with whiplash injury. Treatment includes physiotherapy and painkillers. Full recovery expected in six months."
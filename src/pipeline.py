@@ -5,53 +5,220 @@ Orchestrates all components to process medical conversations
 
 import json
 import os
-from typing import Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
 from datetime import datetime
 
-from .preprocessing import preprocess_conversation
-from .ner_extraction import extract_ner_from_conversation
-from .keyword_extraction import extract_keywords_from_conversation
-from .summarization import summarize_conversation
-from .sentiment_intent import analyze_sentiment_intent
-from .soap_generator import generate_soap_note
+from .preprocessing import preprocess_conversation, segment_conversation
+from .ner_extraction import extract_ner_from_conversation, extract_ner_from_conversation_batch
+from .keyword_extraction import (
+    KEYBERT_AVAILABLE, _get_keybert,
+    extract_keywords_from_conversation, extract_keywords_from_conversation_batch
+)
+from .summarization import TRANSFORMERS_AVAILABLE as SUMMARIZER_AVAILABLE, _get_summarizer, summarize_conversation
+from .sentiment_intent import (
+    TRANSFORMERS_AVAILABLE as SENTIMENT_MODEL_AVAILABLE, _get_sentiment_pipe,
+    analyze_sentiment_intent, analyze_sentiment_intent_batch
+)
+from .soap_generator import extract_patient_name, generate_soap_note
 
+# Sections of the complete output that are also saved as separate files
+SECTION_FILES = {
+    "Medical_Report": "medical_summary.json",
+    "Sentiment_Intent": "sentiment_intent.json",
+    "SOAP_Note": "soap_note.json"
+}
 
-def run_pipeline(input_file_path: str, output_dir: str = "outputs") -> Dict:
+
+def preload_models() -> None:
+    """
+    Load the KeyBERT, sentiment and summarization models up front.
+    
+    The models are cached per process, so this only moves their load time
+    out of the first analysis. spaCy models are loaded when their modules
+    are imported.
+    """
+    loaders = [
+        ("KeyBERT", KEYBERT_AVAILABLE, _get_keybert),
+        ("sentiment", SENTIMENT_MODEL_AVAILABLE, _get_sentiment_pipe),
+        ("summarization", SUMMARIZER_AVAILABLE, _get_summarizer),
+    ]
+    for name, available, loader in loaders:
+        if not available:
+            continue
+        try:
+            loader()
+        except Exception as e:
+            print(f"Warning: could not preload {name} model: {e}")
+
+
+def run_pipeline(input_file_path: str, output_dir: str = "outputs", lazy_spacy: bool = False) -> Dict:
     """
     Run the complete pipeline on a medical conversation file.
     
     Args:
         input_file_path: Path to raw conversation file
         output_dir: Directory to save outputs
+        lazy_spacy: Extract entities by keyword matching only and skip spaCy NER
         
     Returns:
         Dictionary with all extracted information
     """
     print(f"Starting pipeline for: {input_file_path}")
     
-    # Ensure output directory exists
-    os.makedirs(output_dir, exist_ok=True)
-    
     # Step 1: Preprocessing
     print("Step 1: Preprocessing conversation...")
     processed_data = preprocess_conversation(input_file_path)
     
-    # Step 2: NER Extraction
+    return run_processed_pipeline(processed_data, output_dir, lazy_spacy)
+
+
+def run_pipeline_from_text(raw_text: str, output_dir: str = "outputs", lazy_spacy: bool = False) -> Dict:
+    """
+    Run the complete pipeline on raw conversation text already in memory.
+    
+    Args:
+        raw_text: Raw conversation text with speaker tags
+        output_dir: Directory to save outputs
+        lazy_spacy: Extract entities by keyword matching only and skip spaCy NER
+        
+    Returns:
+        Dictionary with all extracted information
+    """
+    print("Starting pipeline for in-memory conversation")
+    
+    # Step 1: Preprocessing
+    print("Step 1: Preprocessing conversation...")
+    processed_data = segment_conversation(raw_text)
+    
+    return run_processed_pipeline(processed_data, output_dir, lazy_spacy)
+
+
+def run_processed_pipeline(processed_data: Dict[str, str], output_dir: str = "outputs", lazy_spacy: bool = False) -> Dict:
+    """
+    Run pipeline steps 2-7 on a preprocessed conversation and save the outputs.
+    
+    Args:
+        processed_data: Dictionary with 'doctor_text', 'patient_text', 'full_text'
+        output_dir: Directory to save outputs
+        lazy_spacy: Extract entities by keyword matching only and skip spaCy NER
+        
+    Returns:
+        Dictionary with all extracted information
+    """
+    ner_data, keyword_data, summary_data, sentiment_data = run_model_stages(processed_data, lazy_spacy)
+    
+    # Steps 6-7: Medical report and SOAP note
+    final_output = build_final_output(processed_data, ner_data, keyword_data, summary_data, sentiment_data)
+    
+    # Save outputs
+    print("Saving outputs...")
+    save_outputs(final_output, output_dir)
+    
+    print("Pipeline completed successfully!")
+    print(f"Outputs saved to: {output_dir}/")
+    
+    return final_output
+
+
+def run_model_stages(processed_data: Dict[str, str], lazy_spacy: bool = False) -> Tuple[Dict, Dict, Dict, Dict]:
+    """
+    Run pipeline steps 2-5 (NER, keywords, summary, sentiment) on a preprocessed conversation.
+    
+    Args:
+        processed_data: Dictionary with 'doctor_text', 'patient_text', 'full_text'
+        lazy_spacy: Extract entities by keyword matching only and skip spaCy NER
+        
+    Returns:
+        NER, keyword, summary and sentiment results
+    """
+    # Steps 2-5 only read processed_data, so they run concurrently (the model
+    # calls release the GIL). NER and keywords may share one spaCy model;
+    # spacy_models.parse serializes calls on it.
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        # Step 2: NER Extraction
+        print("Step 2: Extracting medical entities...")
+        ner_future = executor.submit(extract_ner_from_conversation, processed_data, lazy_spacy)
+        
+        # Step 3: Keyword Extraction
+        print("Step 3: Extracting keywords...")
+        keyword_future = executor.submit(extract_keywords_from_conversation, processed_data)
+        
+        # Step 4: Summarization
+        print("Step 4: Generating medical summary...")
+        summary_future = executor.submit(summarize_conversation, processed_data)
+        
+        # Step 5: Sentiment & Intent Analysis
+        print("Step 5: Analyzing sentiment and intent...")
+        sentiment_future = executor.submit(analyze_sentiment_intent, processed_data)
+        
+        ner_data = ner_future.result()
+        keyword_data = keyword_future.result()
+        summary_data = summary_future.result()
+        sentiment_data = sentiment_future.result()
+    
+    return ner_data, keyword_data, summary_data, sentiment_data
+
+
+def run_pipeline_batch(
+    input_file_paths: List[str],
+    output_dir: str = "outputs",
+    lazy_spacy: bool = False
+) -> List[Dict]:
+    """
+    Run the complete pipeline on several medical conversation files.
+    
+    NER, keyword extraction and sentiment analysis process all conversations
+    in batched model calls. Outputs for each file are saved to a subdirectory
+    of output_dir named after the file.
+    
+    Args:
+        input_file_paths: Paths to raw conversation files
+        output_dir: Directory to save outputs
+        lazy_spacy: Extract entities by keyword matching only and skip spaCy NER
+        
+    Returns:
+        List of dictionaries with all extracted information, in input order
+    """
+    print(f"Starting batch pipeline for {len(input_file_paths)} files")
+    
+    print("Step 1: Preprocessing conversations...")
+    processed_batch = [preprocess_conversation(path) for path in input_file_paths]
+    
     print("Step 2: Extracting medical entities...")
-    ner_data = extract_ner_from_conversation(processed_data)
+    ner_batch = extract_ner_from_conversation_batch(processed_batch, lazy_spacy=lazy_spacy)
     
-    # Step 3: Keyword Extraction
     print("Step 3: Extracting keywords...")
-    keyword_data = extract_keywords_from_conversation(processed_data)
+    keyword_batch = extract_keywords_from_conversation_batch(processed_batch)
     
-    # Step 4: Summarization
-    print("Step 4: Generating medical summary...")
-    summary_data = summarize_conversation(processed_data)
+    print("Step 4: Generating medical summaries...")
+    summary_batch = [summarize_conversation(processed_data) for processed_data in processed_batch]
     
-    # Step 5: Sentiment & Intent Analysis
     print("Step 5: Analyzing sentiment and intent...")
-    sentiment_data = analyze_sentiment_intent(processed_data)
+    sentiment_batch = analyze_sentiment_intent_batch(processed_batch)
+    
+    results = []
+    for path, processed_data, ner_data, keyword_data, summary_data, sentiment_data in zip(
+            input_file_paths, processed_batch, ner_batch, keyword_batch, summary_batch, sentiment_batch):
+        final_output = build_final_output(processed_data, ner_data, keyword_data, summary_data, sentiment_data)
+        file_output_dir = os.path.join(output_dir, os.path.splitext(os.path.basename(path))[0])
+        save_outputs(final_output, file_output_dir)
+        results.append(final_output)
+    
+    print("Batch pipeline completed successfully!")
+    print(f"Outputs saved to: {output_dir}/")
     
+    return results
+
+
+def build_final_output(
+    processed_data: Dict[str, str],
+    ner_data: Dict,
+    keyword_data: Dict,
+    summary_data: Dict,
+    sentiment_data: Dict
+) -> Dict:
+    """Build the medical report and SOAP note and combine all stage results."""
     # Step 6: Generate Structured Medical Report
     print("Step 6: Generating structured medical report...")
     medical_report = {
@@ -69,7 +236,7 @@ def run_pipeline(input_file_path: str, output_dir: str = "outputs") -> Dict:
     soap_note = generate_soap_note(processed_data, ner_data, summary_data.get("Medical_Summary", ""))
     
     # Combine all results
-    final_output = {
+    return {
         "Medical_Report": medical_report,
         "NER_Extraction": ner_data,
         "Keywords": keyword_data,
@@ -77,46 +244,42 @@ def run_pipeline(input_file_path: str, output_dir: str = "outputs") -> Dict:
         "Sentiment_Intent": sentiment_data,
         "SOAP_Note": soap_note
     }
+
+
+def save_outputs(final_output: Dict, output_dir: str) -> None:
+    """
+    Save the pipeline results as JSON files in output_dir.
     
-    # Save outputs
-    print("Saving outputs...")
+    Each section of final_output is serialized once; the section files and
+    complete_output.json are written from the same strings.
     
-    # Save medical summary
-    with open(os.path.join(output_dir, "medical_summary.json"), 'w', encoding='utf-8') as f:
-        json.dump(medical_report, f, indent=2, ensure_ascii=False)
+    Args:
+        final_output: Combined results from build_final_output
+        output_dir: Directory to save outputs
+    """
+    os.makedirs(output_dir, exist_ok=True)
     
-    # Save sentiment and intent
-    with open(os.path.join(output_dir, "sentiment_intent.json"), 'w', encoding='utf-8') as f:
-        json.dump(sentiment_data, f, indent=2, ensure_ascii=False)
+    sections = {key: json.dumps(value, indent=2, ensure_ascii=False) for key, value in final_output.items()}
     
-    # Save SOAP note
-    with open(os.path.join(output_dir, "soap_note.json"), 'w', encoding='utf-8') as f:
-        json.dump(soap_note, f, indent=2, ensure_ascii=False)
+    # Save medical summary, sentiment and intent, and SOAP note
+    for key, file_name in SECTION_FILES.items():
+        with open(os.path.join(output_dir, file_name), 'w', encoding='utf-8') as f:
+            f.write(sections[key])
     
-    # Save complete output
+    # Save complete output (same layout as json.dump(final_output, indent=2))
     with open(os.path.join(output_dir, "complete_output.json"), 'w', encoding='utf-8') as f:
-        json.dump(final_output, f, indent=2, ensure_ascii=False)
-    
-    print("Pipeline completed successfully!")
-    print(f"Outputs saved to: {output_dir}/")
-    
-    return final_output
+        f.write(join_json_sections(sections))
 
 
-def extract_patient_name(text: str) -> str:
-    """Extract patient name from text."""
-    import re
-    patterns = [
-        r'Patient:\s*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)',
-        r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?),?\s+(?:how|feeling|doing)',
+def join_json_sections(sections: Dict[str, str]) -> str:
+    """Combine indent=2 JSON strings of top-level values into one indent=2 JSON object."""
+    if not sections:
+        return "{}"
+    members = [
+        f'  {json.dumps(key, ensure_ascii=False)}: {text.replace(chr(10), chr(10) + "  ")}'
+        for key, text in sections.items()
     ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, text)
-        if match:
-            return match.group(1)
-    
-    return "Patient"
+    return "{\n" + ",\n".join(members) + "\n}"
 
 
 if __name__ == "__main__":
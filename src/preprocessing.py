@@ -5,22 +5,29 @@ Handles cleaning, normalization, and segmentation of medical conversations
 
 import re
 import json
+import mmap
+import os
 from typing import Dict, List
 
+# Patterns compiled once at import
+SPEAKER_TAG_PATTERN = re.compile(r'^(Doctor|Patient):\s*', re.MULTILINE)
+WHITESPACE_PATTERN = re.compile(r'\s+')
+MULTI_PERIOD_PATTERN = re.compile(r'\.{2,}')
+
 
 def remove_speaker_tags(text: str) -> str:
     """Remove speaker tags like 'Doctor:' and 'Patient:' from text."""
     # Remove speaker tags at the beginning of lines
-    text = re.sub(r'^(Doctor|Patient):\s*', '', text, flags=re.MULTILINE)
+    text = SPEAKER_TAG_PATTERN.sub('', text)
     return text.strip()
 
 
 def normalize_text(text: str) -> str:
     """Normalize text by removing extra whitespace and fixing common issues."""
     # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text)
+    text = WHITESPACE_PATTERN.sub(' ', text)
     # Remove multiple periods
-    text = re.sub(r'\.{2,}', '.', text)
+    text = MULTI_PERIOD_PATTERN.sub('.', text)
     return text.strip()
 
 
@@ -38,19 +45,17 @@ def segment_conversation(text: str) -> Dict[str, str]:
     patient_lines = []
     all_lines = []
     
-    lines = text.split('\n')
-    
-    for line in lines:
+    for line in text.split('\n'):
         line = line.strip()
         if not line:
             continue
             
         if line.startswith('Doctor:'):
-            doctor_text = line.replace('Doctor:', '').strip()
+            doctor_text = line[len('Doctor:'):].lstrip()
             doctor_lines.append(doctor_text)
             all_lines.append(doctor_text)
         elif line.startswith('Patient:'):
-            patient_text = line.replace('Patient:', '').strip()
+            patient_text = line[len('Patient:'):].lstrip()
             patient_lines.append(patient_text)
             all_lines.append(patient_text)
         else:
@@ -77,6 +82,27 @@ def segment_conversation(text: str) -> Dict[str, str]:
     }
 
 
+def read_transcript(file_path: str) -> str:
+    """
+    Read a transcript file as UTF-8 text through a read-only memory map.
+    
+    The text is decoded straight from the mapped pages, so no intermediate
+    bytes copy of the file is made.
+    
+    Args:
+        file_path: Path to the raw conversation file
+        
+    Returns:
+        File contents as a string
+    """
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # Empty files cannot be memory-mapped
+            return ""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return str(mapped, 'utf-8')
+
+
 def preprocess_conversation(file_path: str) -> Dict[str, str]:
     """
     Main preprocessing function that reads a conversation file and processes it.
@@ -88,8 +114,7 @@ def preprocess_conversation(file_path: str) -> Dict[str, str]:
         Dictionary with processed text segments
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            raw_text = f.read()
+        raw_text = read_transcript(file_path)
     except FileNotFoundError:
         raise FileNotFoundError(f"Conversation file not found: {file_path}")
     
@@ -98,7 +123,6 @@ def preprocess_conversation(file_path: str) -> Dict[str, str]:
     
     # Save processed data
     output_path = file_path.replace('raw_transcripts', 'processed').replace('.txt', '.json')
-    import os
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
     
     with open(output_path, 'w', encoding='utf-8') as f:
@@ -4,16 +4,35 @@ Analyzes patient sentiment and intent from conversation
 """
 
 import json
+import os
 import re
+from functools import lru_cache
 from typing import Dict, List
 
+from .keyword_matching import compile_keywords, find_keywords
+
 try:
-    from transformers import pipeline
+    import torch
+    from transformers import AutoTokenizer, pipeline
     TRANSFORMERS_AVAILABLE = True
 except ImportError:
     TRANSFORMERS_AVAILABLE = False
     print("Warning: Transformers not available. Using rule-based sentiment analysis.")
 
+try:
+    from optimum.onnxruntime import ORTModelForSequenceClassification
+    OPTIMUM_AVAILABLE = True
+except ImportError:
+    OPTIMUM_AVAILABLE = False
+
+
+SENTIMENT_MODEL_NAME = "distilbert-base-uncased-finetuned-sst-2-english"
+
+# INT8 ONNX export of the sentiment model, used on CPU when present
+# (create it with export_quantized_sentiment_model)
+QUANTIZED_SENTIMENT_MODEL_DIR = os.path.join("models", "sentiment")
+QUANTIZED_SENTIMENT_MODEL_FILE = "model_quantized.onnx"
+
 
 # Sentiment categories
 SENTIMENT_CATEGORIES = ["Anxious", "Neutral", "Reassured"]
@@ -54,6 +73,55 @@ RECOVERY_CONFIRMING_KEYWORDS = [
     'much better', 'doing well', 'getting better'
 ]
 
+# Compiled matchers so each rule-based classifier scans the text once
+SENTIMENT_MATCHER = compile_keywords(ANXIOUS_KEYWORDS + REASSURED_KEYWORDS)
+INTENT_MATCHER = compile_keywords(
+    SYMPTOM_REPORTING_KEYWORDS + REASSURANCE_SEEKING_KEYWORDS + RECOVERY_CONFIRMING_KEYWORDS
+)
+
+
+@lru_cache(maxsize=None)
+def _get_sentiment_pipe():
+    """Load the DistilBERT sentiment pipeline once per process, on GPU when available."""
+    # Use half the cores for intra-op work and avoid nested inter-op pools
+    torch.set_num_threads(max(1, (os.cpu_count() or 1) // 2))
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Only allowed before any inter-op parallel work has started
+        pass
+    if torch.cuda.is_available():
+        return pipeline("sentiment-analysis", model=SENTIMENT_MODEL_NAME, device=0)
+    
+    if OPTIMUM_AVAILABLE and os.path.isfile(os.path.join(QUANTIZED_SENTIMENT_MODEL_DIR, QUANTIZED_SENTIMENT_MODEL_FILE)):
+        model = ORTModelForSequenceClassification.from_pretrained(
+            QUANTIZED_SENTIMENT_MODEL_DIR, file_name=QUANTIZED_SENTIMENT_MODEL_FILE
+        )
+        tokenizer = AutoTokenizer.from_pretrained(QUANTIZED_SENTIMENT_MODEL_DIR)
+        return pipeline("sentiment-analysis", model=model, tokenizer=tokenizer)
+    
+    return pipeline("sentiment-analysis", model=SENTIMENT_MODEL_NAME, device=-1)
+
+
+def export_quantized_sentiment_model(output_dir: str = QUANTIZED_SENTIMENT_MODEL_DIR) -> None:
+    """
+    Export the sentiment model to ONNX with dynamic INT8 quantization.
+    
+    One-time setup step; afterwards _get_sentiment_pipe loads the quantized
+    model from output_dir on CPU. Requires optimum[onnxruntime].
+    
+    Args:
+        output_dir: Directory to save the quantized model and tokenizer
+    """
+    from optimum.onnxruntime import ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    
+    model = ORTModelForSequenceClassification.from_pretrained(SENTIMENT_MODEL_NAME, export=True)
+    quantizer = ORTQuantizer.from_pretrained(model)
+    quantization_config = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+    quantizer.quantize(save_dir=output_dir, quantization_config=quantization_config)
+    AutoTokenizer.from_pretrained(SENTIMENT_MODEL_NAME).save_pretrained(output_dir)
+
 
 def analyze_sentiment_transformers(text: str) -> str:
     """Analyze sentiment using transformer model."""
@@ -61,32 +129,59 @@ def analyze_sentiment_transformers(text: str) -> str:
         return analyze_sentiment_rule_based(text)
     
     try:
-        # Use distilbert for sentiment analysis
-        sentiment_analyzer = pipeline("sentiment-analysis", 
-                                      model="distilbert-base-uncased-finetuned-sst-2-english")
-        
-        result = sentiment_analyzer(text[:512])  # Limit length
-        label = result[0]['label']
-        score = result[0]['score']
-        
-        # Map to our categories
-        if label == 'POSITIVE' and score > 0.7:
-            return "Reassured"
-        elif label == 'NEGATIVE' and score > 0.7:
-            return "Anxious"
-        else:
-            return "Neutral"
+        return _classify_sentiment(text[:512])  # Limit length
     except Exception as e:
         print(f"Transformer sentiment analysis failed: {e}")
         return analyze_sentiment_rule_based(text)
 
 
+@lru_cache(maxsize=4096)
+def _classify_sentiment(text: str) -> str:
+    """Classify text with the transformer model, memoized so repeated texts skip inference."""
+    # Use distilbert for sentiment analysis
+    sentiment_analyzer = _get_sentiment_pipe()
+    
+    with torch.inference_mode():
+        result = sentiment_analyzer(text, truncation=True)
+    return _map_sentiment_prediction(result[0])
+
+
+def analyze_sentiment_transformers_batch(texts: List[str], batch_size: int = 64) -> List[str]:
+    """Analyze sentiment of several texts with batched transformer inference."""
+    if not texts:
+        return []
+    if not TRANSFORMERS_AVAILABLE:
+        return [analyze_sentiment_rule_based(text) for text in texts]
+    
+    try:
+        sentiment_analyzer = _get_sentiment_pipe()
+        with torch.inference_mode():
+            results = sentiment_analyzer([text[:512] for text in texts], batch_size=batch_size, truncation=True)
+        return [_map_sentiment_prediction(result) for result in results]
+    except Exception as e:
+        print(f"Transformer sentiment analysis failed: {e}")
+        return [analyze_sentiment_rule_based(text) for text in texts]
+
+
+def _map_sentiment_prediction(prediction: Dict) -> str:
+    """Map a POSITIVE/NEGATIVE model prediction to our sentiment categories."""
+    label = prediction['label']
+    score = prediction['score']
+    
+    if label == 'POSITIVE' and score > 0.7:
+        return "Reassured"
+    elif label == 'NEGATIVE' and score > 0.7:
+        return "Anxious"
+    else:
+        return "Neutral"
+
+
 def analyze_sentiment_rule_based(text: str) -> str:
     """Rule-based sentiment analysis using keywords."""
-    text_lower = text.lower()
+    found = find_keywords(SENTIMENT_MATCHER, text.lower())
     
-    anxious_score = sum(1 for keyword in ANXIOUS_KEYWORDS if keyword in text_lower)
-    reassured_score = sum(1 for keyword in REASSURED_KEYWORDS if keyword in text_lower)
+    anxious_score = sum(1 for keyword in ANXIOUS_KEYWORDS if keyword in found)
+    reassured_score = sum(1 for keyword in REASSURED_KEYWORDS if keyword in found)
     
     if anxious_score > reassured_score and anxious_score > 0:
         return "Anxious"
@@ -98,11 +193,11 @@ def analyze_sentiment_rule_based(text: str) -> str:
 
 def analyze_intent_rule_based(text: str) -> str:
     """Rule-based intent analysis."""
-    text_lower = text.lower()
+    found = find_keywords(INTENT_MATCHER, text.lower())
     
-    symptom_score = sum(1 for keyword in SYMPTOM_REPORTING_KEYWORDS if keyword in text_lower)
-    reassurance_score = sum(1 for keyword in REASSURANCE_SEEKING_KEYWORDS if keyword in text_lower)
-    recovery_score = sum(1 for keyword in RECOVERY_CONFIRMING_KEYWORDS if keyword in text_lower)
+    symptom_score = sum(1 for keyword in SYMPTOM_REPORTING_KEYWORDS if keyword in found)
+    reassurance_score = sum(1 for keyword in REASSURANCE_SEEKING_KEYWORDS if keyword in found)
+    recovery_score = sum(1 for keyword in RECOVERY_CONFIRMING_KEYWORDS if keyword in found)
     
     scores = {
         "Reporting symptoms": symptom_score,
@@ -148,6 +243,38 @@ def analyze_sentiment_intent(processed_data: Dict[str, str]) -> Dict[str, str]:
     }
 
 
+def analyze_sentiment_intent_batch(processed_batch: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    """
+    Analyze sentiment and intent for several processed conversations.
+    
+    Sentiment for all non-empty patient texts is computed in one batched
+    transformer call.
+    
+    Args:
+        processed_batch: List of dictionaries with processed text
+        
+    Returns:
+        List of dictionaries with sentiment and intent, in input order
+    """
+    patient_texts = [processed_data.get("patient_text", "") for processed_data in processed_batch]
+    sentiments = iter(analyze_sentiment_transformers_batch([text for text in patient_texts if text]))
+    
+    results = []
+    for patient_text in patient_texts:
+        if not patient_text:
+            results.append({
+                "Sentiment": "Neutral",
+                "Intent": "Describing condition"
+            })
+            continue
+        results.append({
+            "Sentiment": next(sentiments),
+            "Intent": analyze_intent_rule_based(patient_text)
+        })
+    
+    return results
+
+
 if __name__ == "__main__":
     # Test sentiment and intent analysis
     test_patient_text = "I'm doing much better, thank you. The neck pain has reduced significantly. I was worried it might take longer, but I'm really looking forward to getting back to normal activities."
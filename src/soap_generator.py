@@ -5,22 +5,60 @@ Converts medical conversation into structured SOAP clinical notes
 
 import json
 import re
-from typing import Dict, List
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Tuple
 from datetime import datetime
 
+from .keyword_matching import compile_keywords, find_keywords
+
+# Patterns compiled once at import
+SENTENCE_SPLIT_PATTERN = re.compile(r'[.!?]+')
+MEDICATION_NAME_PATTERN = re.compile(r'(\w+(?:\s+\w+)?)\s+(?:medication|medicine|drug|painkiller)', re.IGNORECASE)
+
+# Look for patterns like "Janet" or "Patient: [Name]"
+PATIENT_NAME_PATTERN = re.compile(
+    r'Patient:\s*(?P<labeled>[A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)'
+    r'|(?P<addressed>[A-Z][a-z]+(?:\s+[A-Z][a-z]+)?),?\s+(?:how|feeling|doing)'
+)
+
+# Keywords that route a sentence to each SOAP extractor
+SECTION_KEYWORDS = {
+    "chief_complaint": ['pain', 'ache', 'discomfort', 'problem', 'issue'],
+    "concerns": ['worried', 'concerned', 'afraid', 'uncertain', 'question'],
+    "examination": ['examination', 'exam', 'observed', 'found', 'noted', 'appears'],
+    "observations": ['progress', 'improving', 'healing', 'better', 'recovery'],
+    "diagnostic": ['diagnosed', 'diagnosis', 'test', 'result', 'finding'],
+    "medications": ['medication', 'medicine', 'drug', 'painkiller', 'prescription', 'pill'],
+    "therapy": ['physiotherapy', 'therapy', 'exercise', 'session', 'treatment'],
+    "followup": ['follow-up', 'follow up', 'appointment', 'schedule', 'next visit'],
+}
+
+# Most sentences each section keeps (None: no limit; medications are deduplicated later)
+SECTION_LIMITS = {
+    "chief_complaint": 1,
+    "concerns": 5,
+    "examination": 3,
+    "observations": 5,
+    "diagnostic": 5,
+    "medications": None,
+    "therapy": 5,
+    "followup": 1,
+}
+
+# Keyword -> sections it belongs to, and one matcher over all section keywords
+KEYWORD_SECTIONS = {
+    keyword: frozenset(section for section, keywords in SECTION_KEYWORDS.items() if keyword in keywords)
+    for section_keywords in SECTION_KEYWORDS.values()
+    for keyword in section_keywords
+}
+SECTION_KEYWORD_MATCHER = compile_keywords(KEYWORD_SECTIONS)
+
 
 def extract_patient_name(text: str) -> str:
-    """Extract patient name from conversation."""
-    # Look for patterns like "Janet" or "Patient: [Name]"
-    patterns = [
-        r'Patient:\s*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)',
-        r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?),?\s+(?:how|feeling|doing)',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, text)
-        if match:
-            return match.group(1)
+    """Extract patient name from conversation (first name found in the text)."""
+    match = PATIENT_NAME_PATTERN.search(text)
+    if match:
+        return match.group("labeled") or match.group("addressed")
     
     return "Patient"
 
@@ -48,19 +86,24 @@ def generate_soap_note(
     # Extract patient name
     patient_name = extract_patient_name(full_text)
     
+    # Split each text once and sort its sentences into section buckets in one pass
+    patient_buckets = classify_sentences(split_sentences(patient_text), ("chief_complaint", "concerns"))
+    doctor_buckets = classify_sentences(split_sentences(doctor_text), ("examination", "observations", "followup"))
+    full_buckets = classify_sentences(split_sentences(full_text), ("diagnostic", "medications", "therapy"))
+    
     # SUBJECTIVE: Patient's reported symptoms and concerns
     subjective = {
-        "Chief_Complaint": extract_chief_complaint(patient_text),
+        "Chief_Complaint": extract_chief_complaint(patient_buckets["chief_complaint"]),
         "History_of_Present_Illness": extract_hpi(patient_text, ner_data),
         "Patient_Reported_Symptoms": ner_data.get("Symptoms", []),
-        "Patient_Concerns": extract_concerns(patient_text)
+        "Patient_Concerns": extract_concerns(patient_buckets["concerns"])
     }
     
     # OBJECTIVE: Clinical observations and findings
     objective = {
-        "Physical_Examination": extract_examination_findings(doctor_text),
-        "Clinical_Observations": extract_observations(doctor_text),
-        "Diagnostic_Information": extract_diagnostic_info(full_text)
+        "Physical_Examination": extract_examination_findings(doctor_buckets["examination"]),
+        "Clinical_Observations": extract_observations(doctor_buckets["observations"]),
+        "Diagnostic_Information": extract_diagnostic_info(full_buckets["diagnostic"])
     }
     
     # ASSESSMENT: Diagnosis and clinical assessment
@@ -73,9 +116,9 @@ def generate_soap_note(
     # PLAN: Treatment plan and follow-up
     plan = {
         "Treatment_Plan": ner_data.get("Treatment", []),
-        "Medications": extract_medications(full_text),
-        "Therapy_Recommendations": extract_therapy(full_text),
-        "Follow_Up": extract_followup(doctor_text),
+        "Medications": extract_medications(full_buckets["medications"]),
+        "Therapy_Recommendations": extract_therapy(full_buckets["therapy"]),
+        "Follow_Up": extract_followup(doctor_buckets["followup"]),
         "Prognosis": ' '.join(ner_data.get("Prognosis", [])) if ner_data.get("Prognosis") else "Not specified"
     }
     
@@ -91,13 +134,71 @@ def generate_soap_note(
     return soap_note
 
 
-def extract_chief_complaint(patient_text: str) -> str:
-    """Extract chief complaint from patient text."""
-    # Look for first significant symptom mention
-    sentences = re.split(r'[.!?]+', patient_text)
-    for sentence in sentences:
-        if any(keyword in sentence.lower() for keyword in ['pain', 'ache', 'discomfort', 'problem', 'issue']):
-            return sentence.strip()[:200]  # Limit length
+def split_sentences(text: str) -> List[Tuple[str, str]]:
+    """Split text into non-empty (sentence, lowercased sentence) pairs on '.', '!' and '?'."""
+    # Lowercase the whole text in one call; lowercasing never adds or removes
+    # sentence punctuation, so both splits line up piece by piece (the lowered
+    # text is only used for ASCII keyword matching)
+    pieces = SENTENCE_SPLIT_PATTERN.split(text)
+    lowered_pieces = SENTENCE_SPLIT_PATTERN.split(text.lower())
+    
+    sentences = []
+    for sentence, sentence_lower in zip(pieces, lowered_pieces):
+        sentence = sentence.strip()
+        if sentence:
+            sentences.append((sentence, sentence_lower.strip()))
+    return sentences
+
+
+@lru_cache(maxsize=4096)
+def sentence_sections(sentence_lower: str) -> FrozenSet[str]:
+    """
+    Return the SOAP sections whose keywords occur in a sentence.
+    
+    All section keywords are matched in one scan, and results are cached so a
+    sentence shared by the patient/doctor and full texts is scanned only once.
+    
+    Args:
+        sentence_lower: Lowercased sentence text
+        
+    Returns:
+        Set of SECTION_KEYWORDS keys
+    """
+    sections = set()
+    for keyword in find_keywords(SECTION_KEYWORD_MATCHER, sentence_lower):
+        sections.update(KEYWORD_SECTIONS[keyword])
+    return frozenset(sections)
+
+
+def classify_sentences(sentences: List[Tuple[str, str]], sections: Tuple[str, ...]) -> Dict[str, List[str]]:
+    """
+    Sort sentences into SOAP section buckets in a single pass.
+    
+    Each sentence is matched once against all section keywords and added to
+    every requested section it belongs to, until that section's
+    SECTION_LIMITS entry is reached.
+    
+    Args:
+        sentences: (sentence, lowercased sentence) pairs from split_sentences
+        sections: SECTION_KEYWORDS keys to collect
+        
+    Returns:
+        Dictionary mapping each requested section to its sentences, in text order
+    """
+    buckets = {section: [] for section in sections}
+    for sentence, sentence_lower in sentences:
+        for section in sentence_sections(sentence_lower):
+            bucket = buckets.get(section)
+            if bucket is not None and (SECTION_LIMITS[section] is None or len(bucket) < SECTION_LIMITS[section]):
+                bucket.append(sentence)
+    return buckets
+
+
+def extract_chief_complaint(sentences: List[str]) -> str:
+    """Extract chief complaint from the patient's symptom sentences."""
+    # First significant symptom mention
+    if sentences:
+        return sentences[0][:200]  # Limit length
     return "Not specified"
 
 
@@ -110,100 +211,52 @@ def extract_hpi(patient_text: str, ner_data: Dict) -> str:
     return "See patient text for details"
 
 
-def extract_concerns(patient_text: str) -> List[str]:
-    """Extract patient concerns."""
-    concerns = []
-    concern_keywords = ['worried', 'concerned', 'afraid', 'uncertain', 'question']
-    
-    sentences = re.split(r'[.!?]+', patient_text)
-    for sentence in sentences:
-        if any(keyword in sentence.lower() for keyword in concern_keywords):
-            concerns.append(sentence.strip())
-    
-    return concerns[:5]  # Limit to 5 concerns
+def extract_concerns(sentences: List[str]) -> List[str]:
+    """Extract patient concerns from the patient's concern sentences."""
+    return sentences[:5]  # Limit to 5 concerns
 
 
-def extract_examination_findings(doctor_text: str) -> str:
-    """Extract physical examination findings."""
-    exam_keywords = ['examination', 'exam', 'observed', 'found', 'noted', 'appears']
-    
-    sentences = re.split(r'[.!?]+', doctor_text)
-    exam_sentences = [
-        s.strip() for s in sentences
-        if any(keyword in s.lower() for keyword in exam_keywords)
-    ]
-    
-    if exam_sentences:
-        return '. '.join(exam_sentences[:3])
+def extract_examination_findings(sentences: List[str]) -> str:
+    """Extract physical examination findings from the doctor's examination sentences."""
+    if sentences:
+        return '. '.join(sentences[:3])
     return "No specific examination findings documented"
 
 
-def extract_observations(doctor_text: str) -> List[str]:
-    """Extract clinical observations."""
-    observations = []
-    observation_keywords = ['progress', 'improving', 'healing', 'better', 'recovery']
-    
-    sentences = re.split(r'[.!?]+', doctor_text)
-    for sentence in sentences:
-        if any(keyword in sentence.lower() for keyword in observation_keywords):
-            observations.append(sentence.strip())
-    
-    return observations[:5]
+def extract_observations(sentences: List[str]) -> List[str]:
+    """Extract clinical observations from the doctor's observation sentences."""
+    return sentences[:5]
 
 
-def extract_diagnostic_info(text: str) -> List[str]:
-    """Extract diagnostic information."""
-    diagnostic_info = []
-    diagnostic_keywords = ['diagnosed', 'diagnosis', 'test', 'result', 'finding']
-    
-    sentences = re.split(r'[.!?]+', text)
-    for sentence in sentences:
-        if any(keyword in sentence.lower() for keyword in diagnostic_keywords):
-            diagnostic_info.append(sentence.strip())
-    
-    return diagnostic_info[:5]
+def extract_diagnostic_info(sentences: List[str]) -> List[str]:
+    """Extract diagnostic information from diagnostic sentences."""
+    return sentences[:5]
 
 
-def extract_medications(text: str) -> List[str]:
-    """Extract medications mentioned."""
+def extract_medications(sentences: List[str]) -> List[str]:
+    """Extract medications mentioned in medication sentences."""
     medications = []
-    medication_keywords = ['medication', 'medicine', 'drug', 'painkiller', 'prescription', 'pill']
     
-    sentences = re.split(r'[.!?]+', text)
     for sentence in sentences:
-        if any(keyword in sentence.lower() for keyword in medication_keywords):
-            # Try to extract medication name
-            medication_match = re.search(r'(\w+(?:\s+\w+)?)\s+(?:medication|medicine|drug|painkiller)', sentence, re.IGNORECASE)
-            if medication_match:
-                medications.append(medication_match.group(1))
-            else:
-                medications.append(sentence.strip()[:100])
+        # Try to extract medication name
+        medication_match = MEDICATION_NAME_PATTERN.search(sentence)
+        if medication_match:
+            medications.append(medication_match.group(1))
+        else:
+            medications.append(sentence[:100])
     
-    return list(set(medications))[:10]
+    return list(dict.fromkeys(medications))[:10]  # Ordered, deduplicated
 
 
-def extract_therapy(text: str) -> List[str]:
-    """Extract therapy recommendations."""
-    therapy = []
-    therapy_keywords = ['physiotherapy', 'therapy', 'exercise', 'session', 'treatment']
-    
-    sentences = re.split(r'[.!?]+', text)
-    for sentence in sentences:
-        if any(keyword in sentence.lower() for keyword in therapy_keywords):
-            therapy.append(sentence.strip()[:150])
-    
-    return therapy[:5]
+def extract_therapy(sentences: List[str]) -> List[str]:
+    """Extract therapy recommendations from therapy sentences."""
+    return [sentence[:150] for sentence in sentences[:5]]
 
 
-def extract_followup(doctor_text: str) -> str:
-    """Extract follow-up information."""
-    followup_keywords = ['follow-up', 'follow up', 'appointment', 'schedule', 'next visit']
-    
-    sentences = re.split(r'[.!?]+', doctor_text)
-    for sentence in sentences:
-        if any(keyword in sentence.lower() for keyword in followup_keywords):
-            return sentence.strip()
-    
+def extract_followup(sentences: List[str]) -> str:
+    """Extract follow-up information from the doctor's follow-up sentences."""
+    if sentences:
+        return sentences[0]
     return "Follow-up as needed"
 
 
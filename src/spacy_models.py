@@ -0,0 +1,93 @@
+"""
+spaCy Models Module
+Loads each spaCy model once per process so all modules share the same object
+"""
+
+import os
+import threading
+from functools import lru_cache
+from typing import Dict, Iterable, Optional
+
+try:
+    import spacy
+    SPACY_AVAILABLE = True
+except ImportError:
+    SPACY_AVAILABLE = False
+
+# Components skipped when only doc.ents is used
+NER_DISABLE = ["tagger", "parser", "attribute_ruler", "lemmatizer"]
+
+# Components skipped when only doc.noun_chunks is used
+# (noun chunks need the dependency parse and the POS tags from tagger/attribute_ruler)
+NOUN_CHUNK_DISABLE = ["ner", "lemmatizer"]
+
+# nlp.pipe settings for batch runs over many documents
+PIPE_BATCH_SIZE = 64
+PIPE_N_PROCESS = max(1, (os.cpu_count() or 1) // 2)
+
+# Batches up to this size run in-process: starting worker processes costs
+# more than it saves on small batches, and forking after torch/KeyBERT have
+# started their thread pools can hang
+PIPE_MULTIPROCESS_MIN_TEXTS = 500
+
+
+def pipe_n_process(n_texts: int) -> int:
+    """
+    Choose the nlp.pipe worker process count for a batch.
+    
+    Args:
+        n_texts: Number of texts in the batch
+        
+    Returns:
+        PIPE_N_PROCESS for large batches, otherwise 1
+    """
+    return PIPE_N_PROCESS if n_texts > PIPE_MULTIPROCESS_MIN_TEXTS else 1
+
+# One lock per loaded model, keyed by id(); load_model's cache keeps the
+# models alive, so the ids stay valid
+_MODEL_LOCKS: Dict[int, threading.Lock] = {}
+
+
+@lru_cache(maxsize=None)
+def load_model(name: str) -> Optional["spacy.language.Language"]:
+    """
+    Load a spaCy model once per process.
+    
+    Components are disabled per call (nlp(text, disable=...)) rather than at
+    load time, so the same model can serve both NER and noun chunking.
+    
+    Args:
+        name: Installed spaCy model name
+        
+    Returns:
+        Loaded pipeline, or None if spaCy or the model is not installed
+    """
+    if not SPACY_AVAILABLE:
+        return None
+    try:
+        nlp = spacy.load(name)
+    except OSError:
+        return None
+    _MODEL_LOCKS[id(nlp)] = threading.Lock()
+    return nlp
+
+
+def parse(nlp: "spacy.language.Language", text: str, disable: Iterable[str]) -> "spacy.tokens.Doc":
+    """
+    Run a model loaded by load_model on one text, one call at a time.
+    
+    NER and noun chunking share en_core_web_sm when scispaCy is not
+    installed, and the pipeline runs them in concurrent threads. A spaCy
+    Language object is not guaranteed to be thread-safe, so calls on the
+    same model are serialized; different models still run in parallel.
+    
+    Args:
+        nlp: Pipeline returned by load_model
+        text: Text to process
+        disable: Components to skip for this call
+        
+    Returns:
+        Processed spaCy Doc
+    """
+    with _MODEL_LOCKS[id(nlp)]:
+        return nlp(text, disable=disable)
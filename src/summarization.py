@@ -4,15 +4,97 @@ Generates concise summaries of medical conversations using BART
 """
 
 import json
+import os
+import re
+from functools import lru_cache
 from typing import Dict
 
+from .keyword_matching import compile_keywords, find_keywords
+
 try:
+    import torch
     from transformers import pipeline, BartForConditionalGeneration, BartTokenizer
     TRANSFORMERS_AVAILABLE = True
 except ImportError:
     TRANSFORMERS_AVAILABLE = False
     print("Warning: Transformers not available. Using simple extractive summarization.")
 
+try:
+    import onnxruntime
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    OPTIMUM_AVAILABLE = True
+except ImportError:
+    OPTIMUM_AVAILABLE = False
+
+
+SUMMARIZATION_MODEL_NAME = "facebook/bart-large-cnn"
+
+# ONNX export of the summarization model, used on CPU when present
+# (create it with export_onnx_summarization_model)
+ONNX_SUMMARIZATION_MODEL_DIR = os.path.join("models", "summarization")
+
+# Texts with fewer words than this use extractive summarization instead of BART
+MIN_BART_WORDS = 60
+
+# Tokens shared by consecutive chunks when a long text is summarized in pieces
+CHUNK_OVERLAP_TOKENS = 100
+
+# Keywords that boost a sentence's score in extractive summarization
+MEDICAL_KEYWORDS = ['patient', 'diagnosis', 'treatment', 'symptom', 'pain', 'injury',
+                    'recovery', 'therapy', 'medication', 'doctor', 'condition']
+MEDICAL_KEYWORD_MATCHER = compile_keywords(MEDICAL_KEYWORDS)
+
+
+@lru_cache(maxsize=None)
+def _get_summarizer():
+    """
+    Load the BART summarization pipeline once per process.
+    
+    Runs on GPU in bfloat16 (float16 where bf16 is unsupported) when
+    available. On CPU, the ONNX Runtime export is used if present; otherwise
+    the Linear layers are dynamically quantized to int8, which cuts weight
+    memory traffic several-fold.
+    """
+    if torch.cuda.is_available():
+        dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+        model = BartForConditionalGeneration.from_pretrained(SUMMARIZATION_MODEL_NAME, torch_dtype=dtype)
+        tokenizer = BartTokenizer.from_pretrained(SUMMARIZATION_MODEL_NAME)
+        return pipeline("summarization", model=model, tokenizer=tokenizer, device=0)
+    
+    if OPTIMUM_AVAILABLE and os.path.isfile(os.path.join(ONNX_SUMMARIZATION_MODEL_DIR, "encoder_model.onnx")):
+        session_options = onnxruntime.SessionOptions()
+        session_options.intra_op_num_threads = os.cpu_count() or 1
+        model = ORTModelForSeq2SeqLM.from_pretrained(
+            ONNX_SUMMARIZATION_MODEL_DIR,
+            provider="CPUExecutionProvider",
+            session_options=session_options
+        )
+        tokenizer = BartTokenizer.from_pretrained(ONNX_SUMMARIZATION_MODEL_DIR)
+        return pipeline("summarization", model=model, tokenizer=tokenizer)
+    
+    model = BartForConditionalGeneration.from_pretrained(SUMMARIZATION_MODEL_NAME)
+    model.eval()
+    quantized_model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    tokenizer = BartTokenizer.from_pretrained(SUMMARIZATION_MODEL_NAME)
+    return pipeline("summarization", model=quantized_model, tokenizer=tokenizer, device=-1)
+
+
+def export_onnx_summarization_model(output_dir: str = ONNX_SUMMARIZATION_MODEL_DIR) -> None:
+    """
+    Export the BART summarization model to ONNX.
+    
+    One-time setup step; afterwards _get_summarizer runs the encoder and
+    decoder graphs with ONNX Runtime on CPU. Requires optimum[onnxruntime].
+    
+    Args:
+        output_dir: Directory to save the ONNX model and tokenizer
+    """
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    
+    model = ORTModelForSeq2SeqLM.from_pretrained(SUMMARIZATION_MODEL_NAME, export=True)
+    model.save_pretrained(output_dir)
+    BartTokenizer.from_pretrained(SUMMARIZATION_MODEL_NAME).save_pretrained(output_dir)
+
 
 def summarize_with_bart(text: str, max_length: int = 150, min_length: int = 50) -> str:
     """
@@ -29,19 +111,28 @@ def summarize_with_bart(text: str, max_length: int = 150, min_length: int = 50)
     if not TRANSFORMERS_AVAILABLE:
         return summarize_simple(text)
     
+    # Short texts: extractive summary is as good and skips a BART pass
+    if len(text.split()) < MIN_BART_WORDS:
+        return summarize_simple(text)
+    
     try:
         # Use facebook/bart-large-cnn for summarization
-        summarizer = pipeline("summarization", model="facebook/bart-large-cnn")
+        summarizer = _get_summarizer()
         
-        # Handle long texts by chunking
-        if len(text) > 1024:
-            # Split into chunks and summarize each
-            chunks = [text[i:i+1024] for i in range(0, len(text), 1024)]
-            summaries = []
-            for chunk in chunks:
-                summary = summarizer(chunk, max_length=max_length, min_length=min_length, do_sample=False)
-                summaries.append(summary[0]['summary_text'])
-            return ' '.join(summaries)
+        # Handle long texts (beyond the model's token limit) by chunking
+        tokenizer = summarizer.tokenizer
+        token_ids = tokenizer(text, add_special_tokens=False)["input_ids"]
+        chunk_size = tokenizer.model_max_length - 2  # Room for <s> and </s>
+        if len(token_ids) > chunk_size:
+            # Split into overlapping token windows and summarize them in one batched call
+            step = chunk_size - CHUNK_OVERLAP_TOKENS
+            chunks = [
+                tokenizer.decode(token_ids[i:i + chunk_size])
+                for i in range(0, len(token_ids) - CHUNK_OVERLAP_TOKENS, step)
+            ]
+            summaries = summarizer(chunks, max_length=max_length, min_length=min_length, do_sample=False,
+                                   batch_size=len(chunks), truncation=True)
+            return ' '.join(summary['summary_text'] for summary in summaries)
         else:
             summary = summarizer(text, max_length=max_length, min_length=min_length, do_sample=False)
             return summary[0]['summary_text']
@@ -62,8 +153,6 @@ def summarize_simple(text: str, num_sentences: int = 3) -> str:
     Returns:
         Summary text
     """
-    import re
-    
     # Split into sentences
     sentences = re.split(r'[.!?]+', text)
     sentences = [s.strip() for s in sentences if len(s.strip()) > 20]
@@ -72,16 +161,11 @@ def summarize_simple(text: str, num_sentences: int = 3) -> str:
         return '. '.join(sentences) + '.'
     
     # Score sentences (simple heuristic: longer sentences with medical keywords)
-    medical_keywords = ['patient', 'diagnosis', 'treatment', 'symptom', 'pain', 'injury', 
-                       'recovery', 'therapy', 'medication', 'doctor', 'condition']
-    
     scored_sentences = []
     for i, sentence in enumerate(sentences):
         score = len(sentence)
-        # Boost score for medical keywords
-        for keyword in medical_keywords:
-            if keyword.lower() in sentence.lower():
-                score += 20
+        # Boost score for each medical keyword present
+        score += 20 * len(find_keywords(MEDICAL_KEYWORD_MATCHER, sentence.lower()))
         # Boost first and last sentences
         if i == 0 or i == len(sentences) - 1:
             score += 10
@@ -90,10 +174,10 @@ def summarize_simple(text: str, num_sentences: int = 3) -> str:
     
     # Sort by score and take top N
     scored_sentences.sort(reverse=True, key=lambda x: x[0])
-    top_sentences = [s[1] for s in scored_sentences[:num_sentences]]
+    top_set = {s[1] for s in scored_sentences[:num_sentences]}
     
     # Sort back to original order
-    top_sentences = [s for s in sentences if s in top_sentences]
+    top_sentences = [s for s in sentences if s in top_set]
     
     return '. '.join(top_sentences) + '.'
 
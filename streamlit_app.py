@@ -1,10 +1,33 @@
 import streamlit as st
 import os
 import json
-from src.pipeline import run_pipeline
+from src.preprocessing import preprocess_conversation, segment_conversation
+from src.pipeline import build_final_output, preload_models, run_model_stages, save_outputs
+
+
+@st.cache_resource(show_spinner="Loading models...")
+def load_models() -> None:
+    """Load the NLP models once per server process, shared by all sessions and reruns."""
+    preload_models()
+
+
+@st.cache_data(max_entries=128, ttl=3600, show_spinner=False)
+def run_cached_model_stages(processed_data: dict) -> tuple:
+    """Run the model stages once per distinct conversation; repeat analyses hit the cache."""
+    return run_model_stages(processed_data)
+
+
+def analyze_conversation(processed_data: dict) -> dict:
+    """Build the report from the (cached) model results and save the outputs on every run."""
+    result = build_final_output(processed_data, *run_cached_model_stages(processed_data))
+    save_outputs(result, "outputs")
+    return result
+
 
 st.title("Swasthya - Medical Conversation Analyzer")
 
+load_models()
+
 st.markdown("""
 This app processes medical conversations to extract key information including:
 - Named Entity Recognition (NER)
@@ -20,15 +43,13 @@ st.header("Select Input File")
 option = st.radio("Choose input method:", ("Upload a file", "Select from existing files"))
 
 input_file = None
+file_bytes = None
 
 if option == "Upload a file":
     uploaded_file = st.file_uploader("Choose a text file", type="txt")
     if uploaded_file is not None:
-        # Save uploaded file temporarily
-        temp_path = "temp_uploaded_file.txt"
-        with open(temp_path, "wb") as f:
-            f.write(uploaded_file.getvalue())
-        input_file = temp_path
+        # Analyze the upload in memory; no temporary file is written
+        file_bytes = uploaded_file.getvalue()
         st.success(f"File uploaded: {uploaded_file.name}")
 
 elif option == "Select from existing files":
@@ -45,10 +66,15 @@ elif option == "Select from existing files":
         st.error("data/raw_transcripts/ directory not found")
 
 # Run button
-if input_file and st.button("Run Analysis"):
+if (file_bytes is not None or input_file) and st.button("Run Analysis"):
     with st.spinner("Processing conversation... This may take a few minutes."):
         try:
-            result = run_pipeline(input_file)
+            if file_bytes is not None:
+                processed_data = segment_conversation(file_bytes.decode("utf-8"))
+            else:
+                # Also saves the processed conversation under data/processed/
+                processed_data = preprocess_conversation(input_file)
+            result = analyze_conversation(processed_data)
 
             st.success("Analysis complete!")
 
@@ -89,8 +115,4 @@ if input_file and st.button("Run Analysis"):
 
         except Exception as e:
             st.error(f"Error processing file: {str(e)}")
-            st.exception(e)
-
-# Clean up temp file if uploaded
-if option == "Upload a file" and input_file and os.path.exists("temp_uploaded_file.txt"):
-    os.remove("temp_uploaded_file.txt")
\ No newline at end of file
+            st.exception(e)
\ No newline at end of file